@@ -6,6 +6,7 @@ Handles user credits, billing cycles, memory limits, and API usage tracking
 import json
 import os
 import logging
+import tempfile
 from datetime import datetime, timezone, timedelta
 from functools import wraps
 from typing import Dict, Any, Optional, Tuple
@@ -48,12 +49,29 @@ class CreditSystem:
     
     def save_users(self, users: Dict[str, Any]) -> bool:
         """Save users to file"""
+        temp_file = None
         try:
-            with open(self.users_file, 'w') as f:
+            # Write to a per-call temporary file, fsync it and swap it in, so a
+            # crash or power loss can't leave users.json truncated and
+            # concurrent saves don't share a temp file
+            fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(self.users_file) or '.',
+                                             suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
                 json.dump(users, f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(self.users_file):
+                # mkstemp creates owner-only files; keep the existing permissions
+                os.chmod(temp_file, os.stat(self.users_file).st_mode & 0o777)
+            os.replace(temp_file, self.users_file)
             return True
         except Exception as e:
             logger.error(f"Error saving users: {e}")
+            try:
+                if temp_file and os.path.exists(temp_file):
+                    os.remove(temp_file)
+            except OSError:
+                pass
             return False
     
     def get_user(self, api_key: str) -> Optional[Dict[str, Any]]:
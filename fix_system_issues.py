@@ -7,18 +7,88 @@ import os
 import json
 import subprocess
 import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, TextIO
+
+@dataclass
+class Report:
+    """Streams fixes and issues to a log file, keeping only counts in memory
+    
+    Entries recorded before open() are held until the sink is available, so
+    the logs directory is never created as a side effect of reporting. If the
+    log file can't be opened or written, entries go to stderr instead.
+    """
+    log_path: str = 'logs/fix_system_issues.log'
+    fixes_count: int = 0
+    issues_count: int = 0
+    sink: Optional[TextIO] = None
+    pending: List[str] = field(default_factory=list)
+    
+    @property
+    def location(self):
+        return 'stderr' if self.sink is sys.stderr else self.log_path
+    
+    def open(self):
+        """Open the log sink and write a header marking the start of this run"""
+        try:
+            self.sink = open(self.log_path, 'a', buffering=8192)
+        except OSError:
+            self.sink = sys.stderr
+        pending, self.pending = self.pending, []
+        self._emit(f"===== fix_system_issues run started {datetime.now().isoformat()} =====\n")
+        for line in pending:
+            self._emit(line)
+    
+    def _emit(self, line):
+        try:
+            self.sink.write(line)
+        except OSError:
+            self.sink = sys.stderr
+            self.sink.write(line)
+    
+    def _write(self, kind, message):
+        line = f"[{datetime.now().isoformat()}] {kind}: {message}\n"
+        if self.sink is None:
+            self.pending.append(line)
+        else:
+            self._emit(line)
+    
+    def add_fix(self, message):
+        self.fixes_count += 1
+        self._write("FIX", message)
+    
+    def add_issue(self, message):
+        self.issues_count += 1
+        self._write("ISSUE", message)
+    
+    def close(self):
+        if self.sink is not None and self.sink is not sys.stderr:
+            try:
+                self.sink.close()
+            except OSError:
+                pass
+        self.sink = None
 
 class SystemFixer:
+    STATUS_EMOJI = {"INFO": "ℹ️", "PASS": "✅", "FAIL": "❌", "WARN": "⚠️", "FIX": "🔧"}
+    
     def __init__(self):
-        self.issues_found = []
-        self.fixes_applied = []
+        self.report = Report()
         
     def log(self, message, status="INFO"):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        status_emoji = {"INFO": "ℹ️", "PASS": "✅", "FAIL": "❌", "WARN": "⚠️", "FIX": "🔧"}
-        print(f"[{timestamp}] {status_emoji.get(status, 'ℹ️')} {message}")
+        print(f"[{timestamp}] {self.STATUS_EMOJI.get(status, 'ℹ️')} {message}")
+    
+    def log_batch(self, messages, status="INFO"):
+        """Log several messages with a single write instead of one print per line"""
+        if not messages:
+            return
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        prefix = f"[{timestamp}] {self.STATUS_EMOJI.get(status, 'ℹ️')} "
+        sys.stdout.write(''.join(f"{prefix}{message}\n" for message in messages))
+        sys.stdout.flush()
     
     def check_memory_file(self):
         """Check and fix memory.json issues"""
@@ -28,7 +98,7 @@ class SystemFixer:
             self.log("memory.json not found, creating...", "FIX")
             with open('memory.json', 'w') as f:
                 json.dump([], f)
-            self.fixes_applied.append("Created missing memory.json")
+            self.report.add_fix("Created missing memory.json")
             return True
         
         try:
@@ -45,7 +115,7 @@ class SystemFixer:
                 with open('memory.json', 'w') as f:
                     json.dump([], f)
                 
-                self.fixes_applied.append(f"Fixed corrupted memory.json (backup: {backup_name})")
+                self.report.add_fix(f"Fixed corrupted memory.json (backup: {backup_name})")
                 return True
             
             self.log(f"memory.json is valid with {len(data)} entries", "PASS")
@@ -61,7 +131,7 @@ class SystemFixer:
             with open('memory.json', 'w') as f:
                 json.dump([], f)
             
-            self.fixes_applied.append(f"Fixed corrupted JSON (backup: {backup_name})")
+            self.report.add_fix(f"Fixed corrupted JSON (backup: {backup_name})")
             return True
     
     def check_required_files(self):
@@ -81,7 +151,8 @@ class SystemFixer:
         
         if missing_files:
             self.log(f"Missing files: {', '.join(missing_files)}", "WARN")
-            self.issues_found.extend(missing_files)
+            for missing in missing_files:
+                self.report.add_issue(missing)
         else:
             self.log("All required files present", "PASS")
         
@@ -103,12 +174,12 @@ class SystemFixer:
                 # Try to kill processes using port 5000
                 try:
                     subprocess.run(['pkill', '-f', 'python.*main.py'], check=False)
-                    self.fixes_applied.append("Killed processes using port 5000")
+                    self.report.add_fix("Killed processes using port 5000")
                     self.log("Freed port 5000", "PASS")
                     return True
                 except:
                     self.log("Could not free port 5000 automatically", "WARN")
-                    self.issues_found.append("Port 5000 conflict")
+                    self.report.add_issue("Port 5000 conflict")
                     return False
             else:
                 self.log("Port 5000 is available", "PASS")
@@ -137,7 +208,8 @@ class SystemFixer:
                     self.log(f"Syntax error in {file}: {e}", "FAIL")
         
         if syntax_errors:
-            self.issues_found.extend(syntax_errors)
+            for error_msg in syntax_errors:
+                self.report.add_issue(error_msg)
             return False
         
         return True
@@ -162,12 +234,13 @@ class SystemFixer:
             try:
                 subprocess.run([sys.executable, '-m', 'pip', 'install'] + missing_modules, 
                              check=True, capture_output=True)
-                self.fixes_applied.append(f"Installed missing modules: {', '.join(missing_modules)}")
+                self.report.add_fix(f"Installed missing modules: {', '.join(missing_modules)}")
                 self.log("Dependencies installed successfully", "PASS")
                 return True
             except subprocess.CalledProcessError as e:
                 self.log(f"Failed to install dependencies: {e}", "FAIL")
-                self.issues_found.extend([f"Missing module: {m}" for m in missing_modules])
+                for m in missing_modules:
+                    self.report.add_issue(f"Missing module: {m}")
                 return False
         
         return True
@@ -179,7 +252,7 @@ class SystemFixer:
         if not os.path.exists('logs'):
             self.log("Creating logs directory...", "FIX")
             os.makedirs('logs', exist_ok=True)
-            self.fixes_applied.append("Created logs directory")
+            self.report.add_fix("Created logs directory")
         else:
             self.log("Logs directory exists", "PASS")
         
@@ -202,14 +275,14 @@ class SystemFixer:
                 self.log("Memory saving test passed", "PASS")
             else:
                 self.log("Memory saving test failed", "FAIL")
-                self.issues_found.append("Memory saving functionality broken")
+                self.report.add_issue("Memory saving functionality broken")
                 return False
             
             return True
             
         except Exception as e:
             self.log(f"Basic functionality test failed: {e}", "FAIL")
-            self.issues_found.append(f"Basic functionality error: {e}")
+            self.report.add_issue(f"Basic functionality error: {e}")
             return False
     
     def run_health_check(self):
@@ -234,58 +307,66 @@ class SystemFixer:
             self.log(f"Health check error: {e}", "FAIL")
             return False
     
+    def _run_check(self, check_name, check_func):
+        """Run a single check, treating a crash as a failure"""
+        self.log(f"Running {check_name} check...", "INFO")
+        try:
+            return check_func()
+        except Exception as e:
+            self.log(f"{check_name} check crashed: {e}", "FAIL")
+            return False
+    
     def fix_all_issues(self):
         """Run all checks and fixes"""
         self.log("🔧 Starting MemoryOS System Fixer", "INFO")
         self.log("=" * 50, "INFO")
         
+        # The logs directory check runs first so the report can open its log
+        # file there; everything else is recorded after the sink is open
         checks = [
             ("Memory File", self.check_memory_file),
             ("Required Files", self.check_required_files),
             ("Port Conflicts", self.check_port_conflicts),
             ("Python Syntax", self.check_python_syntax),
             ("Dependencies", self.check_dependencies),
-            ("Logs Directory", self.check_logs_directory),
             ("Basic Functionality", self.test_basic_functionality),
         ]
         
         all_passed = True
+        report = self.report
         
-        for check_name, check_func in checks:
-            self.log(f"Running {check_name} check...", "INFO")
-            try:
-                if not check_func():
-                    all_passed = False
-            except Exception as e:
-                self.log(f"{check_name} check crashed: {e}", "FAIL")
+        try:
+            if not self._run_check("Logs Directory", self.check_logs_directory):
                 all_passed = False
-        
-        # Try health check if server might be running
-        self.run_health_check()
+            report.open()
+            
+            for check_name, check_func in checks:
+                if not self._run_check(check_name, check_func):
+                    all_passed = False
+            
+            # Try health check if server might be running
+            self.run_health_check()
+        finally:
+            log_location = report.location
+            report.close()
         
         # Summary
-        self.log("=" * 50, "INFO")
-        self.log("🏁 SYSTEM FIXER SUMMARY", "INFO")
-        self.log("=" * 50, "INFO")
+        self.log_batch(["=" * 50, "🏁 SYSTEM FIXER SUMMARY", "=" * 50], "INFO")
         
-        if self.fixes_applied:
-            self.log("Fixes Applied:", "INFO")
-            for fix in self.fixes_applied:
-                self.log(f"  • {fix}", "FIX")
+        if report.fixes_count:
+            self.log(f"Fixes Applied: {report.fixes_count} (see {log_location})", "FIX")
         
-        if self.issues_found:
-            self.log("Issues Found (manual fix needed):", "WARN")
-            for issue in self.issues_found:
-                self.log(f"  • {issue}", "FAIL")
+        if report.issues_count:
+            self.log(f"Issues Found (manual fix needed): {report.issues_count} (see {log_location})", "WARN")
         
-        if all_passed and not self.issues_found:
+        if all_passed and not report.issues_count:
             self.log("🎉 ALL CHECKS PASSED - System is ready!", "PASS")
-        elif self.fixes_applied and not self.issues_found:
+        elif report.fixes_count and not report.issues_count:
             self.log("✅ ISSUES FIXED - System should be working now!", "PASS")
         else:
             self.log("⚠️ SOME ISSUES REMAIN - Manual intervention needed", "WARN")
         
-        return all_passed and not self.issues_found
+        return all_passed and not report.issues_count
 
 def main():
     fixer = SystemFixer()
@@ -6,16 +6,113 @@ Watches for signs of user frustration without limiting creativity
 
 import json
 import logging
+import random
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional
-from collections import deque
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from bisect import bisect_right
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 import re
 
+# Patterns used to normalize commands and error messages
+_NUM_RE = re.compile(r'\b\d+\b')
+_STR_RE = re.compile(r"'[^']*'")
+_PATH_RE = re.compile(r'/[^/\s]*')
+_WS_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=256)
+def _normalize_error(error: str) -> str:
+    """Normalize error message for grouping"""
+    # Remove specific details but keep error type
+    normalized = _NUM_RE.sub('NUM', error)  # Replace numbers
+    normalized = _STR_RE.sub('STR', normalized)  # Replace strings
+    normalized = _PATH_RE.sub('PATH', normalized)  # Replace paths
+    return normalized[:100]  # Truncate
+
+# Intervention suggestions, shared across detection passes
+_FAILED_COMMAND_INTERVENTIONS = (
+    "Show similar command that worked before",
+    "Debug the current command step-by-step",
+    "Try alternative approach from memory"
+)
+
+_COMMAND_INTERVENTIONS = (
+    "Explain what this command does",
+    "Suggest similar commands",
+    "Break down into smaller steps"
+)
+
+_ERROR_INTERVENTIONS = (
+    "Search memory for similar error solutions",
+    "Explain the error in detail",
+    "Suggest known fixes for this error type",
+    "Auto-debug the issue",
+    "Show step-by-step troubleshooting"
+)
+
+_PROGRESS_INTERVENTIONS = (
+    "Review what we've tried so far",
+    "Suggest a different approach",
+    "Take a step back and reassess",
+    "Show successful patterns from memory",
+    "Break problem into smaller pieces"
+)
+
+_SPIKE_INTERVENTIONS = (
+    "Pause and review the error patterns",
+    "Suggest systematic debugging approach",
+    "Show what's worked before in similar situations",
+    "Auto-analyze the error cluster",
+    "Reset to last known good state"
+)
+
+_FATIGUE_INTERVENTIONS = (
+    "Celebrate progress made so far",
+    "Suggest taking a short break",
+    "Auto-save current work state",
+    "Show session summary and achievements",
+    "Offer to continue later with fresh perspective"
+)
+
+# Encouraging messages per pattern type
+_ENCOURAGEMENTS = {
+    "repeated_command": (
+        "I notice you're working hard on this command - that persistence is great!",
+        "You're really diving deep into this - let me help make it work!",
+        "I see you're determined to get this right - that's the spirit!"
+    ),
+    "repeated_error": (
+        "These kinds of errors can be tricky - you're not alone in this!",
+        "I see you're tackling a challenging issue - let's solve it together!",
+        "This error is giving you a workout - let's outsmart it!"
+    ),
+    "no_progress": (
+        "Sometimes the best breakthroughs come after the toughest challenges!",
+        "You're building valuable experience even when things feel stuck!",
+        "Great minds work through complex problems - that's what you're doing!"
+    ),
+    "error_spike": (
+        "Lots of trial and error means you're exploring thoroughly!",
+        "You're learning fast - each error teaches us something new!",
+        "This rapid iteration shows great problem-solving instincts!"
+    ),
+    "session_fatigue": (
+        "Wow, you've been coding for a while - that dedication is impressive!",
+        "Long sessions like this show real commitment to your project!",
+        "You've accomplished a lot today - you should be proud!"
+    )
+}
+
+_DEFAULT_ENCOURAGEMENT = ("You're doing great - keep it up!",)
+
 class FrustrationPattern:
     """Represents a detected frustration pattern"""
     
     def __init__(self, pattern_type: str, severity: float, evidence: List[str], 
-                 suggested_interventions: List[str]):
+                 suggested_interventions: Sequence[str]):
         self.pattern_type = pattern_type
         self.severity = severity  # 0.0 to 1.0
         self.evidence = evidence
@@ -36,6 +133,12 @@ class FrustrationDetector:
         self.error_history = deque(maxlen=20)  # Last 20 errors
         self.command_history = deque(maxlen=30)  # Last 30 commands
         
+        # Normalized error key -> occurrences currently in error_history
+        self._error_key_counts = Counter()
+        
+        # Epoch seconds of the most recent successful interaction
+        self._last_success_ts = None
+        
         # Pattern detection thresholds
         self.thresholds = {
             "repeated_command": 3,  # Same command 3+ times
@@ -59,28 +162,51 @@ class FrustrationDetector:
                          success: bool, context: Dict[str, Any] = None):
         """Track user interactions for pattern analysis"""
         
+        ts = time.time()  # Float epoch seconds for cheap recency math
+        now = datetime.fromtimestamp(ts, timezone.utc)
         interaction = {
             "type": interaction_type,
             "content": content[:200],  # Truncate for storage
             "success": success,
-            "timestamp": datetime.now(timezone.utc),
+            "timestamp": now,
+            "ts": ts,
             "context": context or {}
         }
         
         self.interaction_history.append(interaction)
         
+        if success:
+            self._last_success_ts = ts
+        
         # Track specific patterns
         if not success and interaction_type == "command":
+            error = context.get("error", "Unknown error")
+            error_key = _normalize_error(error)
+            
+            # Keep the key counts in sync with the entry the deque is about to evict
+            if len(self.error_history) == self.error_history.maxlen:
+                evicted_key = self.error_history[0]["error_key"]
+                self._error_key_counts[evicted_key] -= 1
+                if not self._error_key_counts[evicted_key]:
+                    del self._error_key_counts[evicted_key]
+            
             self.error_history.append({
                 "command": content,
-                "error": context.get("error", "Unknown error"),
-                "timestamp": datetime.now(timezone.utc)
+                "error": error,
+                "error_key": error_key,
+                "timestamp": now,
+                "ts": ts
             })
+            self._error_key_counts[error_key] += 1
         
         if interaction_type == "command":
+            normalized = _WS_RE.sub(' ', content.lower().strip())
             self.command_history.append({
                 "command": content,
-                "timestamp": datetime.now(timezone.utc),
+                "normalized": normalized,
+                "words": frozenset(normalized.split()),
+                "timestamp": now,
+                "ts": ts,
                 "success": success
             })
     
@@ -88,6 +214,15 @@ class FrustrationDetector:
         """Analyze patterns and detect potential frustration"""
         
         patterns = []
+        now_ts = time.time()
+        
+        # Skip the detectors while the histories are too short for any to fire
+        if (len(self.error_history) < self.thresholds["repeated_error"]
+                and len(self.command_history) < self.thresholds["repeated_command"]
+                and len(self.interaction_history) < 5
+                and (not self.interaction_history
+                     or now_ts - self.interaction_history[0]["ts"] < self.thresholds["session_length"] * 60)):
+            return patterns
         
         # Check for repeated commands
         repeated_cmd = self._detect_repeated_commands()
@@ -95,22 +230,22 @@ class FrustrationDetector:
             patterns.append(repeated_cmd)
         
         # Check for repeated errors
-        repeated_err = self._detect_repeated_errors()
+        repeated_err = self._detect_repeated_errors(now_ts)
         if repeated_err:
             patterns.append(repeated_err)
         
         # Check for lack of progress
-        no_progress = self._detect_no_progress()
+        no_progress = self._detect_no_progress(now_ts)
         if no_progress:
             patterns.append(no_progress)
         
         # Check for error spikes
-        error_spike = self._detect_error_spike()
+        error_spike = self._detect_error_spike(now_ts)
         if error_spike:
             patterns.append(error_spike)
         
         # Check session fatigue
-        session_fatigue = self._detect_session_fatigue()
+        session_fatigue = self._detect_session_fatigue(now_ts)
         if session_fatigue:
             patterns.append(session_fatigue)
         
@@ -126,17 +261,19 @@ class FrustrationDetector:
         recent_commands = list(self.command_history)[-self.thresholds["repeated_command"]:]
         
         # Check if they're all the same (or very similar)
-        first_cmd = recent_commands[0]["command"]
+        first = recent_commands[0]
+        first_cmd = first["command"]
         similar_count = 1
         
         for cmd in recent_commands[1:]:
-            if self._commands_similar(first_cmd, cmd["command"]):
+            if self._commands_similar(first, cmd):
                 similar_count += 1
         
         if similar_count >= self.thresholds["repeated_command"]:
             failed_attempts = sum(1 for cmd in recent_commands if not cmd["success"])
             
-            severity = min(0.9, (similar_count * 0.2) + (failed_attempts * 0.2))
+            severity = (similar_count * 0.2) + (failed_attempts * 0.2)
+            severity = severity if severity < 0.9 else 0.9
             
             evidence = [
                 f"Repeated command '{first_cmd[:30]}...' {similar_count} times",
@@ -154,31 +291,25 @@ class FrustrationDetector:
         
         return None
     
-    def _detect_repeated_errors(self) -> Optional[FrustrationPattern]:
+    def _detect_repeated_errors(self, now_ts: float) -> Optional[FrustrationPattern]:
         """Detect when user encounters the same error repeatedly"""
         
         if len(self.error_history) < self.thresholds["repeated_error"]:
             return None
         
-        # Group errors by similarity
-        error_groups = {}
-        
-        for error in self.error_history:
-            error_key = self._normalize_error(error["error"])
-            if error_key not in error_groups:
-                error_groups[error_key] = []
-            error_groups[error_key].append(error)
-        
-        # Find groups with repeated errors
-        for error_key, errors in error_groups.items():
-            if len(errors) >= self.thresholds["repeated_error"]:
+        # Find groups with repeated errors, in order of first appearance in
+        # the current history
+        for error_key in dict.fromkeys(e["error_key"] for e in self.error_history):
+            if self._error_key_counts[error_key] >= self.thresholds["repeated_error"]:
                 
                 # Check if recent
-                recent_errors = [e for e in errors 
-                               if (datetime.now(timezone.utc) - e["timestamp"]).total_seconds() < 1800]  # 30 minutes
+                recent_errors = [e for e in self.error_history 
+                               if e["error_key"] == error_key
+                               and now_ts - e["ts"] < 1800]  # 30 minutes
                 
                 if len(recent_errors) >= self.thresholds["repeated_error"]:
-                    severity = min(0.9, len(recent_errors) * 0.3)
+                    severity = len(recent_errors) * 0.3
+                    severity = severity if severity < 0.9 else 0.9
                     
                     evidence = [
                         f"Same error occurred {len(recent_errors)} times",
@@ -196,30 +327,25 @@ class FrustrationDetector:
         
         return None
     
-    def _detect_no_progress(self) -> Optional[FrustrationPattern]:
+    def _detect_no_progress(self, now_ts: float) -> Optional[FrustrationPattern]:
         """Detect when user hasn't made progress for a while"""
         
         if len(self.interaction_history) < 5:
             return None
         
-        now = datetime.now(timezone.utc)
+        last_success_ts = self._last_success_ts
         
-        # Look for last successful interaction
-        last_success = None
-        for interaction in reversed(self.interaction_history):
-            if interaction["success"]:
-                last_success = interaction["timestamp"]
-                break
-        
-        if last_success:
-            time_since_success = (now - last_success).total_seconds() / 60  # minutes
+        if last_success_ts is not None:
+            time_since_success = (now_ts - last_success_ts) / 60  # minutes
             
             if time_since_success >= self.thresholds["no_progress_minutes"]:
-                severity = min(0.8, time_since_success / 30)  # Max at 30 minutes
+                severity = time_since_success / 30
+                severity = severity if severity < 0.8 else 0.8  # Max at 30 minutes
+                last_success = datetime.fromtimestamp(last_success_ts, timezone.utc)
                 
                 evidence = [
                     f"No successful actions for {int(time_since_success)} minutes",
-                    f"Last success: {last_success.strftime('%H:%M')}"
+                    f"Last success: {last_success.hour:02d}:{last_success.minute:02d}"
                 ]
                 
                 interventions = self._suggest_progress_interventions()
@@ -233,21 +359,24 @@ class FrustrationDetector:
         
         return None
     
-    def _detect_error_spike(self) -> Optional[FrustrationPattern]:
+    def _detect_error_spike(self, now_ts: float) -> Optional[FrustrationPattern]:
         """Detect when errors spike in a short time"""
         
         if len(self.error_history) < self.thresholds["error_spike"]:
             return None
         
-        now = datetime.now(timezone.utc)
-        recent_errors = [e for e in self.error_history 
-                        if (now - e["timestamp"]).total_seconds() < 600]  # 10 minutes
+        # Errors are appended in time order, so the recent ones are a suffix
+        first_recent = bisect_right(self.error_history, now_ts - 600,  # 10 minutes
+                                    key=itemgetter("ts"))
+        recent_count = len(self.error_history) - first_recent
         
-        if len(recent_errors) >= self.thresholds["error_spike"]:
-            severity = min(0.9, len(recent_errors) * 0.15)
+        if recent_count >= self.thresholds["error_spike"]:
+            severity = recent_count * 0.15
+            severity = severity if severity < 0.9 else 0.9
+            recent_errors = list(islice(self.error_history, first_recent, None))
             
             evidence = [
-                f"{len(recent_errors)} errors in the last 10 minutes",
+                f"{recent_count} errors in the last 10 minutes",
                 "Error spike detected"
             ]
             
@@ -262,24 +391,35 @@ class FrustrationDetector:
         
         return None
     
-    def _detect_session_fatigue(self) -> Optional[FrustrationPattern]:
+    def _detect_session_fatigue(self, now_ts: float) -> Optional[FrustrationPattern]:
         """Detect long coding sessions that might lead to fatigue"""
         
         if not self.interaction_history:
             return None
         
-        session_start = self.interaction_history[0]["timestamp"]
-        session_duration = (datetime.now(timezone.utc) - session_start).total_seconds() / 60  # minutes
+        session_start = self.interaction_history[0]["ts"]
+        session_duration = (now_ts - session_start) / 60  # minutes
         
         if session_duration >= self.thresholds["session_length"]:
             # Check error rate in recent interactions
-            recent_interactions = [i for i in self.interaction_history if i["timestamp"] > datetime.now(timezone.utc) - timedelta(minutes=30)]
+            cutoff_ts = now_ts - 1800  # 30 minutes
+            recent_count = 0
+            recent_failures = 0
+            
+            # History is in time order, so stop at the first interaction past the cutoff
+            for interaction in reversed(self.interaction_history):
+                if interaction["ts"] <= cutoff_ts:
+                    break
+                recent_count += 1
+                if not interaction["success"]:
+                    recent_failures += 1
             
-            if recent_interactions:
-                error_rate = sum(1 for i in recent_interactions if not i["success"]) / len(recent_interactions)
+            if recent_count:
+                error_rate = recent_failures / recent_count
                 
                 if error_rate > 0.4:  # 40% error rate
-                    severity = min(0.7, (session_duration / 180) + error_rate)  # Factor in duration and errors
+                    severity = (session_duration / 180) + error_rate  # Factor in duration and errors
+                    severity = severity if severity < 0.7 else 0.7
                     
                     evidence = [
                         f"Coding session: {int(session_duration)} minutes",
@@ -309,13 +449,22 @@ class FrustrationDetector:
             return None
         
         # Find highest severity pattern
-        highest_pattern = max(patterns, key=lambda p: p.severity)
-        
-        # Determine intervention level
-        intervention_level = None
-        for level, threshold in self.intervention_levels.items():
-            if highest_pattern.severity >= threshold:
-                intervention_level = level
+        highest_pattern = patterns[0]
+        for pattern in patterns[1:]:
+            if pattern.severity > highest_pattern.severity:
+                highest_pattern = pattern
+        
+        # Determine intervention level, strongest first
+        severity = highest_pattern.severity
+        levels = self.intervention_levels
+        if severity >= levels["auto_debug"]:
+            intervention_level = "auto_debug"
+        elif severity >= levels["help"]:
+            intervention_level = "help"
+        elif severity >= levels["hint"]:
+            intervention_level = "hint"
+        else:
+            intervention_level = None
         
         if intervention_level:
             return {
@@ -327,93 +476,49 @@ class FrustrationDetector:
         
         return None
     
-    def _commands_similar(self, cmd1: str, cmd2: str) -> bool:
-        """Check if two commands are similar"""
-        # Simple similarity check
-        cmd1_norm = re.sub(r'\s+', ' ', cmd1.lower().strip())
-        cmd2_norm = re.sub(r'\s+', ' ', cmd2.lower().strip())
-        
+    def _commands_similar(self, cmd1: Dict[str, Any], cmd2: Dict[str, Any]) -> bool:
+        """Check if two command_history entries are similar"""
         # Exact match
-        if cmd1_norm == cmd2_norm:
+        if cmd1["normalized"] == cmd2["normalized"]:
             return True
         
         # Similar if they share most words
-        words1 = set(cmd1_norm.split())
-        words2 = set(cmd2_norm.split())
+        words1 = cmd1["words"]
+        words2 = cmd2["words"]
         
         if words1 and words2:
-            intersection = len(words1.intersection(words2))
-            union = len(words1.union(words2))
-            return intersection / union > 0.7
+            # Jaccard can't exceed the size ratio, so skip the set math when
+            # one command has far more words than the other
+            len1, len2 = len(words1), len(words2)
+            if len1 > len2:
+                len1, len2 = len2, len1
+            if len1 <= 0.7 * len2:
+                return False
+            return len(words1 & words2) / len(words1 | words2) > 0.7
         
         return False
     
-    def _normalize_error(self, error: str) -> str:
-        """Normalize error message for grouping"""
-        # Remove specific details but keep error type
-        normalized = re.sub(r'\b\d+\b', 'NUM', error)  # Replace numbers
-        normalized = re.sub(r'\'[^\']*\'', 'STR', normalized)  # Replace strings
-        normalized = re.sub(r'/[^/\s]*', 'PATH', normalized)  # Replace paths
-        return normalized[:100]  # Truncate
-    
-    def _suggest_command_interventions(self, command: str, failed_attempts: int) -> List[str]:
+    def _suggest_command_interventions(self, command: str, failed_attempts: int) -> Tuple[str, ...]:
         """Suggest interventions for repeated commands"""
-        interventions = []
-        
         if failed_attempts > 0:
-            interventions.extend([
-                "Show similar command that worked before",
-                "Debug the current command step-by-step",
-                "Try alternative approach from memory"
-            ])
-        
-        interventions.extend([
-            "Explain what this command does",
-            "Suggest similar commands",
-            "Break down into smaller steps"
-        ])
-        
-        return interventions
+            return _FAILED_COMMAND_INTERVENTIONS + _COMMAND_INTERVENTIONS
+        return _COMMAND_INTERVENTIONS
     
-    def _suggest_error_interventions(self, error_pattern: str, errors: List[Dict]) -> List[str]:
+    def _suggest_error_interventions(self, error_pattern: str, errors: List[Dict]) -> Tuple[str, ...]:
         """Suggest interventions for repeated errors"""
-        return [
-            "Search memory for similar error solutions",
-            "Explain the error in detail",
-            "Suggest known fixes for this error type",
-            "Auto-debug the issue",
-            "Show step-by-step troubleshooting"
-        ]
+        return _ERROR_INTERVENTIONS
     
-    def _suggest_progress_interventions(self) -> List[str]:
+    def _suggest_progress_interventions(self) -> Tuple[str, ...]:
         """Suggest interventions when no progress is made"""
-        return [
-            "Review what we've tried so far",
-            "Suggest a different approach",
-            "Take a step back and reassess",
-            "Show successful patterns from memory",
-            "Break problem into smaller pieces"
-        ]
+        return _PROGRESS_INTERVENTIONS
     
-    def _suggest_spike_interventions(self, errors: List[Dict]) -> List[str]:
+    def _suggest_spike_interventions(self, errors: List[Dict]) -> Tuple[str, ...]:
         """Suggest interventions for error spikes"""
-        return [
-            "Pause and review the error patterns",
-            "Suggest systematic debugging approach",
-            "Show what's worked before in similar situations",
-            "Auto-analyze the error cluster",
-            "Reset to last known good state"
-        ]
+        return _SPIKE_INTERVENTIONS
     
-    def _suggest_fatigue_interventions(self) -> List[str]:
+    def _suggest_fatigue_interventions(self) -> Tuple[str, ...]:
         """Suggest interventions for session fatigue"""
-        return [
-            "Celebrate progress made so far",
-            "Suggest taking a short break",
-            "Auto-save current work state",
-            "Show session summary and achievements",
-            "Offer to continue later with fresh perspective"
-        ]
+        return _FATIGUE_INTERVENTIONS
     
     def _create_intervention_actions(self, pattern: FrustrationPattern, level: str) -> List[Dict[str, Any]]:
         """Create actionable intervention suggestions"""
@@ -435,38 +540,7 @@ class FrustrationDetector:
     
     def get_encouragement_message(self, pattern: FrustrationPattern) -> str:
         """Generate encouraging message based on pattern"""
-        
-        encouragements = {
-            "repeated_command": [
-                "I notice you're working hard on this command - that persistence is great!",
-                "You're really diving deep into this - let me help make it work!",
-                "I see you're determined to get this right - that's the spirit!"
-            ],
-            "repeated_error": [
-                "These kinds of errors can be tricky - you're not alone in this!",
-                "I see you're tackling a challenging issue - let's solve it together!",
-                "This error is giving you a workout - let's outsmart it!"
-            ],
-            "no_progress": [
-                "Sometimes the best breakthroughs come after the toughest challenges!",
-                "You're building valuable experience even when things feel stuck!",
-                "Great minds work through complex problems - that's what you're doing!"
-            ],
-            "error_spike": [
-                "Lots of trial and error means you're exploring thoroughly!",
-                "You're learning fast - each error teaches us something new!",
-                "This rapid iteration shows great problem-solving instincts!"
-            ],
-            "session_fatigue": [
-                "Wow, you've been coding for a while - that dedication is impressive!",
-                "Long sessions like this show real commitment to your project!",
-                "You've accomplished a lot today - you should be proud!"
-            ]
-        }
-        
-        import random
-        messages = encouragements.get(pattern.pattern_type, ["You're doing great - keep it up!"])
-        return random.choice(messages)
+        return random.choice(_ENCOURAGEMENTS.get(pattern.pattern_type, _DEFAULT_ENCOURAGEMENT))
 
 # Global instance for the Jav agent
 frustration_detector = None
@@ -13,10 +13,19 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 import subprocess
+import shutil
+import socket
 import re
 import glob
 from persistent_memory_engine import persistent_memory, AutomationPlaybook
 
+# Resolve the git binary once so each status call skips the PATH search
+_GIT = shutil.which('git') or 'git'
+
+# Read-only status query; --no-optional-locks keeps it off the index lock
+# so an audit never contends with a git command the user is running
+_GIT_STATUS_ARGS = (_GIT, '--no-optional-locks', 'status', '--porcelain')
+
 @dataclass
 class JavState:
     """Track current state of development work"""
@@ -306,7 +315,7 @@ class JavAgent:
         
         # Check for recent file changes
         try:
-            result = subprocess.run(['git', 'status', '--porcelain'], capture_output=True, text=True)
+            result = subprocess.run(_GIT_STATUS_ARGS, capture_output=True, text=True)
             if result.returncode == 0:
                 changed_files = [line.strip() for line in result.stdout.split('\n') if line.strip()]
                 audit["files_changed"] = changed_files
@@ -393,7 +402,6 @@ class JavAgent:
         
         # Port availability check
         try:
-            import socket
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             result = sock.connect_ex(('localhost', 5000))
             if result == 0:
@@ -785,7 +793,6 @@ class JavAgent:
     
     def extract_error_type(self, text: str) -> str:
         """Extract error type from text"""
-        import re
         error_patterns = [
             r'(\w*Error)',
             r'(\w*Exception)',
@@ -803,9 +810,12 @@ class JavAgent:
     def get_current_file_types(self) -> List[str]:
         """Get file types in current directory"""
         file_types = set()
-        for file_path in glob.glob("*"):
-            if os.path.isfile(file_path):
-                ext = os.path.splitext(file_path)[1]
+        # scandir serves is_file() from the directory read instead of a stat per entry
+        with os.scandir(".") as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue  # Hidden entries were never matched by glob("*")
+                ext = os.path.splitext(entry.name)[1]
                 if ext:
                     file_types.add(ext[1:])  # Remove dot
         return list(file_types)
@@ -838,7 +848,6 @@ class JavAgent:
     
     def is_port_in_use(self, port: int) -> bool:
         """Check if a port is in use"""
-        import socket
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 return s.connect_ex(('localhost', port)) == 0
@@ -7,6 +7,7 @@ import os
 import json
 import logging
 import secrets
+import shutil
 import string
 from datetime import datetime, timezone
 from flask import Flask, request, jsonify, send_from_directory
@@ -92,7 +93,6 @@ def save_memory(data):
         if os.path.exists(MEMORY_FILE):
             backup_name = f"memory_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             try:
-                import shutil
                 shutil.copy2(MEMORY_FILE, backup_name)
             except:
                 pass  # Backup failed but continue with save
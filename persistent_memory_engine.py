@@ -13,6 +13,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import fnmatch
 import difflib
+import re
+import subprocess
 
 class PatternMatcher:
     """Identifies similar situations across projects"""
@@ -34,7 +36,6 @@ class PatternMatcher:
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract meaningful keywords from text"""
-        import re
         # Extract technical terms, error codes, package names
         keywords = re.findall(r'\b(?:[A-Z][a-z]+Error|[a-z]+_[a-z]+|\w+\.\w+|[A-Z]{2,})\b', text)
         return list(set(keywords))
@@ -44,7 +45,6 @@ class PatternMatcher:
         if not stack_trace:
             return ""
         # Extract function names and error types
-        import re
         functions = re.findall(r'in (\w+)', stack_trace)
         errors = re.findall(r'(\w*Error|\w*Exception)', stack_trace)
         return f"{'+'.join(functions[:3])}|{'+'.join(errors[:2])}"
@@ -426,8 +426,6 @@ class PersistentMemoryEngine:
     
     def _execute_command_step(self, step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a command step"""
-        import subprocess
-        
         try:
             command = step.get("command", "")
             result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
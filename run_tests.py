@@ -10,13 +10,20 @@ import subprocess
 import argparse
 from datetime import datetime
 
+# pytest invocations run without a shell, under the current interpreter
+PYTEST = [sys.executable, "-m", "pytest"]
+
 def run_command(command, description):
-    """Run a command and return success status"""
+    """Run a command and return success status
+    
+    Argument lists are executed directly; strings go through the shell and
+    are reserved for commands that need shell features such as || or redirects.
+    """
     print(f"\n🧪 {description}")
     print("-" * 50)
     
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = subprocess.run(command, shell=isinstance(command, str), capture_output=True, text=True)
         
         if result.stdout:
             print(result.stdout)
@@ -63,9 +70,9 @@ def main():
     
     if args.test:
         # Run specific test pattern
-        verbose_flag = "-v" if args.verbose else ""
+        verbose_flags = ["-v"] if args.verbose else []
         test_commands.append((
-            f"python -m pytest test_memoryos.py -k \"{args.test}\" {verbose_flag}",
+            PYTEST + ["test_memoryos.py", "-k", args.test] + verbose_flags,
             f"Specific tests matching: {args.test}"
         ))
     elif args.quick:
@@ -76,15 +83,15 @@ def main():
         ]
     else:
         # Full test suite
-        verbose_flag = "-v --tb=short" if args.verbose else ""
+        verbose_flags = ["-v", "--tb=short"] if args.verbose else []
         test_commands = [
             ("python bulletproof_startup.py --check-only 2>/dev/null || python -c \"print('Startup checks: SKIPPED (bulletproof_startup.py not available)')\"", "Startup integrity checks"),
-            (f"python -m pytest test_memoryos.py::TestMemoryOperations {verbose_flag}", "Memory operations tests"),
-            (f"python -m pytest test_memoryos.py::TestHealthEndpoint {verbose_flag}", "Health endpoint tests"),
-            (f"python -m pytest test_memoryos.py::TestAPIEndpoints {verbose_flag}", "API endpoint tests"),
-            (f"python -m pytest test_memoryos.py::TestBulletproofLogger {verbose_flag}", "Bulletproof logger tests"),
-            (f"python -m pytest test_memoryos.py::TestSystemResilience {verbose_flag}", "System resilience tests"),
-            (f"python -m pytest test_memoryos.py::TestSystemIntegration {verbose_flag}", "Integration tests"),
+            (PYTEST + ["test_memoryos.py::TestMemoryOperations"] + verbose_flags, "Memory operations tests"),
+            (PYTEST + ["test_memoryos.py::TestHealthEndpoint"] + verbose_flags, "Health endpoint tests"),
+            (PYTEST + ["test_memoryos.py::TestAPIEndpoints"] + verbose_flags, "API endpoint tests"),
+            (PYTEST + ["test_memoryos.py::TestBulletproofLogger"] + verbose_flags, "Bulletproof logger tests"),
+            (PYTEST + ["test_memoryos.py::TestSystemResilience"] + verbose_flags, "System resilience tests"),
+            (PYTEST + ["test_memoryos.py::TestSystemIntegration"] + verbose_flags, "Integration tests"),
         ]
     
     # Run all tests
@@ -7,6 +7,7 @@ import pytest
 import json
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from credit_system import CreditSystem, credit_system
 
@@ -42,6 +43,26 @@ class TestCreditSystem:
         assert 'reset_date' in user
         assert 'created_at' in user
     
+    def test_save_users_replaces_file_atomically(self, tmp_path):
+        """Test saving users swaps in a complete file and leaves no temp file"""
+        cs = CreditSystem(str(tmp_path / "users.json"))
+        users = {"key-1": {"plan": "Free"}, "key-2": {"plan": "Pro"}}
+        assert cs.save_users(users) is True
+        
+        assert cs.load_users() == users
+        assert os.listdir(tmp_path) == ["users.json"]
+    
+    def test_concurrent_saves_all_succeed(self, tmp_path):
+        """Test overlapping saves each use their own temp file"""
+        cs = CreditSystem(str(tmp_path / "users.json"))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: cs.save_users({f"key-{i}": {"plan": "Free"}}),
+                                    range(32)))
+        
+        assert all(results)
+        assert len(cs.load_users()) == 1
+        assert os.listdir(tmp_path) == ["users.json"]
+    
     def test_invalid_plan(self, temp_credit_system):
         """Test creating user with invalid plan"""
         with pytest.raises(ValueError):
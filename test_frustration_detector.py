@@ -0,0 +1,173 @@
+"""
+Test Frustration Detector
+Tests for frustration pattern detection and intervention decisions
+"""
+
+import pytest
+from datetime import datetime, timezone
+import frustration_detector
+from frustration_detector import FrustrationDetector, FrustrationPattern
+
+class FakeClock:
+    """Stand-in for the time module that only moves when told to"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, minutes):
+        self.now += minutes * 60
+
+class TestFrustrationDetector:
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Control the clock the detector reads"""
+        fake = FakeClock()
+        monkeypatch.setattr(frustration_detector, "time", fake)
+        return fake
+
+    @pytest.fixture
+    def detector(self, clock):
+        """Create a detector without a Jav agent attached"""
+        return FrustrationDetector(None)
+
+    def test_no_patterns_on_fresh_session(self, detector):
+        """Test that an empty history produces no patterns"""
+        assert detector.detect_frustration_patterns() == []
+
+    def test_repeated_command_detected(self, detector):
+        """Test repeated similar commands are flagged"""
+        for _ in range(3):
+            detector.track_interaction("command", "npm run build", False,
+                                       {"error": "Build failed"})
+
+        patterns = detector.detect_frustration_patterns()
+        pattern_types = [p.pattern_type for p in patterns]
+        assert "repeated_command" in pattern_types
+
+        repeated = next(p for p in patterns if p.pattern_type == "repeated_command")
+        assert repeated.severity == 0.9
+        assert "3 failed attempts" in repeated.evidence
+
+    def test_distinct_commands_not_flagged(self, detector):
+        """Test unrelated commands are not treated as repeats"""
+        for cmd in ["npm run build", "git status", "python main.py"]:
+            detector.track_interaction("command", cmd, True)
+
+        pattern_types = [p.pattern_type for p in detector.detect_frustration_patterns()]
+        assert "repeated_command" not in pattern_types
+
+    def test_repeated_error_groups_normalized_messages(self, detector):
+        """Test errors differing only in numbers and paths are grouped"""
+        detector.track_interaction("command", "python a.py", False,
+                                   {"error": "Error at line 12 in /tmp/a.py"})
+        detector.track_interaction("command", "python b.py", False,
+                                   {"error": "Error at line 40 in /srv/b.py"})
+
+        patterns = detector.detect_frustration_patterns()
+        repeated = [p for p in patterns if p.pattern_type == "repeated_error"]
+        assert len(repeated) == 1
+        assert "Same error occurred 2 times" in repeated[0].evidence
+
+    def test_error_key_counts_follow_history_eviction(self, detector):
+        """Test normalized error counts drop entries evicted from the history"""
+        detector.track_interaction("command", "make", False, {"error": "old failure"})
+        for i in range(detector.error_history.maxlen):
+            detector.track_interaction("command", f"make {i}", False,
+                                       {"error": f"new failure {i}"})
+
+        assert "old failure" not in detector._error_key_counts
+        assert detector._error_key_counts["new failure NUM"] == detector.error_history.maxlen
+
+    def test_repeated_error_reports_earliest_group_after_eviction(self, detector, clock):
+        """Test the reported group is the first one still present in the history"""
+        for error in ["alpha failure", "beta failure"] * 2 + ["alpha failure"]:
+            detector.track_interaction("command", "make", False, {"error": error})
+        for i in range(detector.error_history.maxlen - 4):
+            detector.track_interaction("command", "make", False,
+                                       {"error": f"filler {chr(97 + i)}"})
+
+        repeated = next(p for p in detector.detect_frustration_patterns()
+                        if p.pattern_type == "repeated_error")
+        assert "Error pattern: beta failure" in repeated.evidence[1]
+
+    def test_error_spike_detected(self, detector):
+        """Test that many recent errors register as a spike"""
+        for i in range(5):
+            detector.track_interaction("command", f"cmd-{i} --flag{i}", False,
+                                       {"error": f"failure kind {chr(97 + i)}"})
+
+        pattern_types = [p.pattern_type for p in detector.detect_frustration_patterns()]
+        assert "error_spike" in pattern_types
+
+    def test_error_spike_ignores_old_errors(self, detector, clock):
+        """Test errors outside the 10 minute window don't count toward a spike"""
+        for i in range(5):
+            detector.track_interaction("command", f"cmd-{i} --flag{i}", False,
+                                       {"error": f"failure kind {chr(97 + i)}"})
+            if i == 0:
+                clock.advance(15)
+
+        pattern_types = [p.pattern_type for p in detector.detect_frustration_patterns()]
+        assert "error_spike" not in pattern_types
+
+    def test_no_progress_detected(self, detector, clock):
+        """Test a long gap since the last success is flagged"""
+        detector.track_interaction("edit", "main.py", True)
+        clock.advance(20)
+        for i in range(4):
+            detector.track_interaction("chat", f"why does step {i} fail", False)
+
+        patterns = detector.detect_frustration_patterns()
+        no_progress = [p for p in patterns if p.pattern_type == "no_progress"]
+        assert len(no_progress) == 1
+        assert "No successful actions for 20 minutes" in no_progress[0].evidence
+        last_success = datetime.fromtimestamp(detector._last_success_ts, timezone.utc)
+        assert f"Last success: {last_success.strftime('%H:%M')}" in no_progress[0].evidence
+
+    def test_session_fatigue_detected_on_short_history(self, detector, clock):
+        """Test fatigue still fires when a long session has only a few interactions"""
+        detector.track_interaction("chat", "start", True)
+        clock.advance(3 * 60)
+        detector.track_interaction("chat", "still broken", False)
+        detector.track_interaction("chat", "nope", False)
+
+        pattern_types = [p.pattern_type for p in detector.detect_frustration_patterns()]
+        assert pattern_types == ["session_fatigue"]
+
+    def test_should_intervene_without_patterns(self, detector):
+        """Test no intervention when nothing was detected"""
+        assert detector.should_intervene([]) is None
+
+    @pytest.mark.parametrize("severity,level", [
+        (0.9, "auto_debug"),
+        (0.8, "auto_debug"),
+        (0.7, "help"),
+        (0.3, "hint"),
+        (0.1, None),
+    ])
+    def test_intervention_level_by_severity(self, detector, severity, level):
+        """Test the strongest matching intervention level is chosen"""
+        pattern = FrustrationPattern("error_spike", severity, [], ["Pause"])
+        result = detector.should_intervene([pattern])
+
+        if level is None:
+            assert result is None
+        else:
+            assert result["level"] == level
+
+    def test_should_intervene_respects_cooldown(self, detector):
+        """Test interventions are suppressed during the cooldown window"""
+        pattern = FrustrationPattern("error_spike", 0.9, [], ["Pause"])
+        assert detector.should_intervene([pattern]) is not None
+
+        detector.mark_intervention_shown()
+        assert detector.should_intervene([pattern]) is None
+
+    def test_encouragement_message_for_unknown_pattern(self, detector):
+        """Test unknown pattern types fall back to a default message"""
+        pattern = FrustrationPattern("unknown", 0.5, [], [])
+        assert detector.get_encouragement_message(pattern) == "You're doing great - keep it up!"